@@ -21,6 +21,20 @@ def setup_class(request, local_infinity):
     yield
     request.cls.test_infinity_obj.disconnect()
 
+# one table per column type, truncated between example values and dropped once all of them ran
+@pytest.fixture(scope="class", params=common_values.types_array)
+def all_row_met_the_condition_table(request, setup_class):
+    test_infinity_obj = request.cls.test_infinity_obj
+    yield test_infinity_obj._create_all_row_met_the_condition_table(request.param)
+    test_infinity_obj._drop_all_row_met_the_condition_table()
+
+# truncate the shared table after every example value, outside trace_expected_exceptions
+@pytest.fixture
+def all_row_met_the_condition_empty_table(all_row_met_the_condition_table):
+    yield all_row_met_the_condition_table
+    all_row_met_the_condition_table.delete()
+    assert all_row_met_the_condition_table.output(["*"]).to_df().empty
+
 @pytest.mark.usefixtures("setup_class")
 class TestInfinity:
     @pytest.fixture
@@ -38,10 +52,11 @@ class TestInfinity:
         self.test_infinity_obj._test_delete_non_existent_table()
 
     @trace_expected_exceptions
-    @pytest.mark.parametrize('column_types', common_values.types_array)
     @pytest.mark.parametrize('column_types_example', common_values.types_example_array)
-    def test_delete_table_all_row_met_the_condition(self, column_types, column_types_example):
-        self.test_infinity_obj._test_delete_table_all_row_met_the_condition(column_types, column_types_example)
+    def test_delete_table_all_row_met_the_condition(self, all_row_met_the_condition_empty_table,
+                                                    column_types_example):
+        self.test_infinity_obj._test_delete_table_all_row_met_the_condition(all_row_met_the_condition_empty_table,
+                                                                            column_types_example)
 
     def test_delete_table_no_rows_met_condition(self):
         self.test_infinity_obj._test_delete_table_no_rows_met_condition()
@@ -11,22 +11,48 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
 import time
 
 import numpy as np
-import pandas as pd
 import pytest
-from numpy import dtype
 from common import common_values
 import infinity
 from infinity.errors import ErrorCode
 from infinity.common import ConflictType, InfinityException
-from internal.utils import trace_expected_exceptions
 from internal.test_sdkbase import TestSdk
 
+# dump table contents after each mutation only when asked to
+VERBOSE = os.environ.get("INFINITY_TEST_VERBOSE")
+
+# seconds to let inserted data age before deleting it, the sdk exposes no flush signal to wait on
+LONG_BEFORE_WAIT = float(os.environ.get("INFINITY_TEST_LONG_BEFORE_WAIT", 10))
+
+# expected contents of test_delete after "c1 = 1" is deleted, and after everything is deleted
+_EXPECTED_KEEP = {'c1': (2, 3, 4), 'c2': (20, 30, 40), 'c3': (200, 300, 400)}
+_EXPECTED_EMPTY = {'c1': (), 'c2': (), 'c3': ()}
+
+
+# compare an all-int32 result frame against expected column values without pandas' generic path
+def _assert_int_cols_equal(df, expected_dict):
+    assert list(df.columns) == list(expected_dict)
+    for col, vals in expected_dict.items():
+        assert df[col].dtype == np.int32
+        assert np.array_equal(df[col].to_numpy(copy=False), np.asarray(vals, dtype=np.int32))
+
+
+# insert an integer column as row dicts, np.int32 is not an int so go through tolist()
+def _insert_int_column(table_obj, col, values_np):
+    return table_obj.insert([{col: value} for value in values_np.tolist()])
+
 
 class TestDelete(TestSdk):
 
+    def connect(self):
+        super().connect()
+        # every delete test works in default_db, so look it up once per connection
+        self.db_obj = self.infinity_obj.get_database("default_db")
+
     # def _test_version(self):
     #     print(infinity.__version__)
 
@@ -56,7 +82,7 @@ class TestDelete(TestSdk):
             - 'table_3'
         expect: all operations successfully
         """
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
 
         # infinity
         db_obj.drop_table(table_name="test_delete", conflict_type=ConflictType.Ignore)
@@ -76,15 +102,13 @@ class TestDelete(TestSdk):
         assert res.error_code == ErrorCode.OK
 
         res = table_obj.output(["*"]).to_df()
-        pd.testing.assert_frame_equal(res, pd.DataFrame({'c1': (2, 3, 4), 'c2': (20, 30, 40), 'c3': (200, 300, 400)})
-                                      .astype({'c1': dtype('int32'), 'c2': dtype('int32'), 'c3': dtype('int32')}))
+        _assert_int_cols_equal(res, _EXPECTED_KEEP)
 
         res = table_obj.delete()
         assert res.error_code == ErrorCode.OK
 
         res = table_obj.output(["*"]).to_df()
-        pd.testing.assert_frame_equal(res, pd.DataFrame({'c1': (), 'c2': (), 'c3': ()})
-                                      .astype({'c1': dtype('int32'), 'c2': dtype('int32'), 'c3': dtype('int32')}))
+        _assert_int_cols_equal(res, _EXPECTED_EMPTY)
 
         res = db_obj.drop_table("test_delete")
         assert res.error_code == ErrorCode.OK
@@ -92,7 +116,7 @@ class TestDelete(TestSdk):
     # delete empty table
     def _test_delete_empty_table(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
 
         tb = db_obj.drop_table("test_delete_empty_table", ConflictType.Ignore)
         assert tb
@@ -112,7 +136,7 @@ class TestDelete(TestSdk):
     # delete non-existent table
     def _test_delete_non_existent_table(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
 
         table_obj = db_obj.drop_table("test_delete_non_existent_table", ConflictType.Ignore)
         assert table_obj
@@ -123,45 +147,46 @@ class TestDelete(TestSdk):
         assert e.type == infinity.common.InfinityException
         assert e.value.args[0] == ErrorCode.TABLE_NOT_EXIST
 
-    # delete table, all rows are met the condition
-    @trace_expected_exceptions
-    @pytest.mark.parametrize('column_types', common_values.types_array)
-    @pytest.mark.parametrize('column_types_example', common_values.types_example_array)
-    def _test_delete_table_all_row_met_the_condition(self, column_types, column_types_example):
-        db_obj = self.infinity_obj.get_database("default_db")
+    # create the table shared by every example value of one column type
+    def _create_all_row_met_the_condition_table(self, column_types):
+        db_obj = self.db_obj
         db_obj.drop_table("test_delete_table_all_row_met_the_condition", ConflictType.Ignore)
-        db_obj.create_table("test_delete_table_all_row_met_the_condition", {"c1": {"type": column_types}},
-                            ConflictType.Error)
-        table_obj = db_obj.get_table("test_delete_table_all_row_met_the_condition")
+        return db_obj.create_table("test_delete_table_all_row_met_the_condition", {"c1": {"type": column_types}},
+                                   ConflictType.Error)
+
+    def _drop_all_row_met_the_condition_table(self):
+        res = self.db_obj.drop_table("test_delete_table_all_row_met_the_condition", ConflictType.Error)
+        assert res.error_code == ErrorCode.OK
+
+    # delete table, all rows are met the condition
+    def _test_delete_table_all_row_met_the_condition(self, table_obj, column_types_example):
+        expr = f"c1 = {column_types_example}"
         try:
             table_obj.insert([{"c1": column_types_example}])
-            print("insert c1 = " + str(column_types_example))
+            print("insert " + expr)
         except Exception as e:
             print(e)
         try:
-            table_obj.delete("c1 = " + str(column_types_example))
-            print("delete c1 = " + str(column_types_example))
+            table_obj.delete(expr)
+            print("delete " + expr)
         except Exception as e:
             print(e)
 
-        db_obj.drop_table("test_delete_table_all_row_met_the_condition", ConflictType.Error)
-
     # delete table, no row is met the condition
     def _test_delete_table_no_rows_met_condition(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
-        for i in range(len(common_values.types_array)):
-            db_obj.drop_table("test_delete_table_no_rows_met_condition" + str(i))
-
-        for i in range(len(common_values.types_array)):
-            tb = db_obj.create_table("test_delete_table_no_rows_met_condition" + str(i),
-                                     {"c1": {"type": common_values.types_array[i]}}, ConflictType.Error)
+        db_obj = self.db_obj
+        pairs = list(zip(common_values.types_array, common_values.types_example_array))
+        for i, (column_type, column_example) in enumerate(pairs):
+            table_name = f"test_delete_table_no_rows_met_condition{i}"
+            db_obj.drop_table(table_name, ConflictType.Ignore)
+            tb = db_obj.create_table(table_name, {"c1": {"type": column_type}}, ConflictType.Error)
             assert tb
 
-            table_obj = db_obj.get_table("test_delete_table_no_rows_met_condition" + str(i))
+            table_obj = db_obj.get_table(table_name)
             try:
-                table_obj.insert([{"c1": common_values.types_example_array[i]}])
-                print("insert c1 = " + str(common_values.types_example_array[i]))
+                table_obj.insert([{"c1": column_example}])
+                print("insert c1 = " + str(column_example))
             except Exception as e:
                 print(e)
             try:
@@ -170,115 +195,112 @@ class TestDelete(TestSdk):
             except Exception as e:
                 print(e)
 
-            res = table_obj.output(["*"]).to_df()
-            print("{}：{}".format(common_values.types_array[i], res))
+            if VERBOSE:
+                res = table_obj.output(["*"]).to_df()
+                print("{}：{}".format(column_type, res))
             assert tb
 
-        for i in range(len(common_values.types_array)):
-            db_obj.drop_table("test_delete_table_no_rows_met_condition" + str(i), ConflictType.Error)
+            db_obj.drop_table(table_name, ConflictType.Error)
 
     # delete table with only one block
     def _test_delete_table_with_one_block(self):
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_delete_table_with_one_block", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_delete_table_with_one_block", {"c1": {"type": "int"}}, ConflictType.Error)
 
         # insert
-        values = [{"c1": 1} for _ in range(8192)]
-        table_obj.insert(values)
-        insert_res = table_obj.output(["*"]).to_df()
-        print(insert_res)
+        table_obj.insert([{"c1": 1}] * 8192)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
 
         # delete
         table_obj.delete("c1 = 1")
-        delete_res = table_obj.output(["*"]).to_df()
-        print(delete_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
         db_obj.drop_table("test_delete_table_with_one_block", ConflictType.Error)
 
     # delete table with multiple blocks, but only one segment
     def _test_delete_table_with_one_segment(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_delete_table_with_one_segment", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_delete_table_with_one_segment", {"c1": {"type": "int"}},
                                         ConflictType.Error)
 
-        # insert
-        for i in range(1024):
-            values = [{"c1": i} for _ in range(10)]
-            table_obj.insert(values)
-        insert_res = table_obj.output(["*"]).to_df()
-        print(insert_res)
+        # insert, in batches that stay below the 8192-row insert limit
+        c1 = np.repeat(np.arange(1024, dtype=np.int32), 10)
+        for batch in np.split(c1, 4):
+            _insert_int_column(table_obj, "c1", batch)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
 
-        # delete
-        for i in range(1024):
-            table_obj.delete("c1 = " + str(i))
+        # delete, c1 covers 0..1023 so one range predicate removes every row
+        table_obj.delete("c1 >= 0 and c1 < 1024")
         delete_res = table_obj.output(["*"]).to_df()
+        assert delete_res.empty
         db_obj.drop_table("test_delete_table_with_one_segment", ConflictType.Error)
 
-        print(delete_res)
+        if VERBOSE:
+            print(delete_res)
 
     # select before delete, select after delete and check the change.
     def _test_select_before_after_delete(self):
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_select_before_after_delete", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_select_before_after_delete", {"c1": {"type": "int"}}, ConflictType.Error)
 
         # insert
         for i in range(10):
-            values = [{"c1": i} for _ in range(10)]
+            values = [{"c1": i}] * 10
             table_obj.insert(values)
-        insert_res = table_obj.output(["*"]).to_df()
-        print(insert_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
 
         # delete
         table_obj.delete("c1 = 1")
-        delete_res = table_obj.output(["*"]).to_df()
-        print(delete_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
         db_obj.drop_table("test_select_before_after_delete", ConflictType.Error)
 
     # delete just inserted data and select to check
     def _test_delete_insert_data(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_delete_insert_data", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_delete_insert_data", {"c1": {"type": "int"}}, ConflictType.Error)
 
         # insert
-        values = [{"c1": 1} for _ in range(10)]
-        table_obj.insert(values)
+        table_obj.insert([{"c1": 1}] * 10)
 
-        # delete
-        table_obj.delete("c1 = 1")
-        delete_res = table_obj.output(["*"]).to_df()
-        print(delete_res)
+        # delete, every row has c1 = 1 so no predicate is needed
+        table_obj.delete()
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
         db_obj.drop_table("test_delete_insert_data", ConflictType.Error)
 
     # delete inserted long before and select to check
     def _test_delete_inserted_long_before_data(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_delete_inserted_long_before_data", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_delete_inserted_long_before_data", {"c1": {"type": "int"}},
                                         ConflictType.Error)
 
         # insert
-        for i in range(1024):
-            values = [{"c1": i} for _ in range(5)]
-            table_obj.insert(values)
+        _insert_int_column(table_obj, "c1", np.repeat(np.arange(1024, dtype=np.int32), 5))
 
-        time.sleep(10)
+        time.sleep(LONG_BEFORE_WAIT)
 
         # delete
         table_obj.delete("c1 = 1")
-        delete_res = table_obj.output(["*"]).to_df()
-        print(delete_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
         db_obj.drop_table("test_delete_inserted_long_before_data", ConflictType.Error)
 
     # delete dropped table
     def _test_delete_dropped_table(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
 
         with pytest.raises(InfinityException) as e:
             db_obj.drop_table("test_delete_dropped_table")
@@ -294,23 +316,24 @@ class TestDelete(TestSdk):
     # various expression will be given in where clause, and check result correctness
     def _test_various_expression_in_where_clause(self, column_types, column_types_example):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_various_expression_in_where_clause", ConflictType.Ignore)
         db_obj.create_table("test_various_expression_in_where_clause", {"c1": {"type": column_types}},
                             ConflictType.Error)
 
         table_obj = db_obj.get_table("test_various_expression_in_where_clause")
 
-        values = [{"c1": column_types_example} for _ in range(5)]
+        values = [{"c1": column_types_example}] * 5
+        expr = f"c1 = {column_types_example}"
         try:
             table_obj.insert(values)
 
-            insert_res = table_obj.output(["*"]).to_df()
-            print(insert_res)
+            if VERBOSE:
+                print(table_obj.output(["*"]).to_df())
 
-            table_obj.delete("c1 = " + str(column_types_example))
-            delete_res = table_obj.output(["*"]).to_df()
-            print(delete_res)
+            table_obj.delete(expr)
+            if VERBOSE:
+                print(table_obj.output(["*"]).to_df())
         except Exception as e:
             print(e)
 
@@ -319,82 +342,81 @@ class TestDelete(TestSdk):
 
     def _test_delete_one_block_without_expression(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_delete_one_block_without_expression", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_delete_one_block_without_expression", {"c1": {"type": "int"}},
                                         ConflictType.Error)
 
         # insert
-        values = [{"c1": 1} for _ in range(8192)]
-        table_obj.insert(values)
-        insert_res = table_obj.output(["*"]).to_df()
-        print(insert_res)
+        table_obj.insert([{"c1": 1}] * 8192)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
 
         # delete
         table_obj.delete()
-        delete_res = table_obj.output(["*"]).to_df()
-        print(delete_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
         res = db_obj.drop_table("test_delete_one_block_without_expression", ConflictType.Error)
         assert res.error_code == ErrorCode.OK
 
     def _test_delete_one_segment_without_expression(self):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_delete_one_segment_without_expression", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_delete_one_segment_without_expression", {"c1": {"type": "int"}},
                                         ConflictType.Error)
 
-        # insert
-        for i in range(1024):
-            values = [{"c1": i} for _ in range(10)]
-            table_obj.insert(values)
-        insert_res = table_obj.output(["*"]).to_df()
-        print(insert_res)
+        # insert, in batches that stay below the 8192-row insert limit
+        c1 = np.repeat(np.arange(1024, dtype=np.int32), 10)
+        for batch in np.split(c1, 4):
+            _insert_int_column(table_obj, "c1", batch)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
 
         # delete
         table_obj.delete()
-        delete_res = table_obj.output(["*"]).to_df()
-        print(delete_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
         db_obj.drop_table("test_delete_one_segment_without_expression", ConflictType.Error)
 
     def _test_filter_with_valid_expression(self, filter_list):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_filter_expression", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_filter_expression", {"c1": {"type": "int"}, "c2": {"type": "float"}},
                                         ConflictType.Error)
 
         # insert
         for i in range(10):
-            values = [{"c1": i, "c2": 3.0} for _ in range(10)]
+            values = [{"c1": i, "c2": 3.0}] * 10
             table_obj.insert(values)
-        insert_res = table_obj.output(["*"]).to_df()
-        print(insert_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
 
         # delete
         table_obj.delete(filter_list)
-        delete_res = table_obj.output(["*"]).to_df()
-        print(delete_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
         db_obj.drop_table("test_filter_expression", ConflictType.Error)
 
     def _test_filter_with_invalid_expression(self, filter_list):
         # connect
-        db_obj = self.infinity_obj.get_database("default_db")
+        db_obj = self.db_obj
         db_obj.drop_table("test_filter_expression", ConflictType.Ignore)
         table_obj = db_obj.create_table("test_filter_expression", {"c1": {"type": "int"}, "c2": {"type": "float"}},
                                         ConflictType.Error)
 
         # insert
         for i in range(10):
-            values = [{"c1": i, "c2": 3.0} for _ in range(10)]
+            values = [{"c1": i, "c2": 3.0}] * 10
             table_obj.insert(values)
-        insert_res = table_obj.output(["*"]).to_df()
-        print(insert_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
 
         # delete
         # TODO: Detailed error information check
         with pytest.raises(Exception):
             table_obj.delete(filter_list)
-        delete_res = table_obj.output(["*"]).to_df()
-        print(delete_res)
+        if VERBOSE:
+            print(table_obj.output(["*"]).to_df())
         db_obj.drop_table("test_filter_expression", ConflictType.Error)
\ No newline at end of file